@@ -1,6 +1,7 @@
 from pytest import raises
 
-from typedpy import Structure, Number, String, Map, Field, Integer, PositiveInt, Array, Set, ImmutableStructure
+from typedpy import Structure, Number, String, Map, Field, Integer, PositiveInt, Array, Set, ImmutableStructure, \
+    ImmutableString, ImmutableInteger, AnyOf
 
 
 class Example(Structure):
@@ -289,3 +290,24 @@ def test_pop_with_minitems_violation():
     with raises(ValueError) as excinfo:
         Foo(m={1: 'x', 2: 'y'}).m.pop(1)
     assert "m: Expected length of at least 2" in str(excinfo.value)
+
+
+def test_multiple_items_with_immutable_values():
+    class Foo(Structure):
+        m = Map[String, ImmutableString]
+
+    foo = Foo(m={"a": "x", "b": "y", "c": "z"})
+    assert foo.m == {"a": "x", "b": "y", "c": "z"}
+    with raises(TypeError) as excinfo:
+        Foo(m={"a": "x", "b": 3})
+    assert "m_value: Got 3; Expected a string" in str(excinfo.value)
+
+
+def test_multiple_items_with_nested_immutable_values():
+    class Foo(Structure):
+        m = Map[String, AnyOf[ImmutableInteger, String]]
+
+    assert Foo(m={"a": 1, "b": 2, "c": "x"}).m == {"a": 1, "b": 2, "c": "x"}
+    with raises(ValueError) as excinfo:
+        Foo(m={"a": 1, "b": 2.5})
+    assert "m_value: 2.5 Did not match any field option" in str(excinfo.value)
@@ -1,6 +1,7 @@
 from pytest import raises
 
-from typedpy import Structure, Number, String, Integer, Set, AnyOf, Map, PositiveInt, ImmutableSet
+from typedpy import Structure, Number, String, Integer, Set, AnyOf, Map, PositiveInt, ImmutableSet, ImmutableString, \
+    ImmutableInteger
 
 
 class Example(Structure):
@@ -167,4 +168,23 @@ def test_immutableset_typerr():
 
 def test_str():
     e = Example(h={1,2,3})
-    assert "h = {1,2,3}" in str(e)
\ No newline at end of file
+    assert "h = {1,2,3}" in str(e)
+
+
+def test_multiple_items_with_immutable_field():
+    class Foo(Structure):
+        s = Set[ImmutableString]
+
+    assert Foo(s={"a", "b", "c"}).s == {"a", "b", "c"}
+    with raises(TypeError):
+        Foo(s={"a", 3})
+
+
+def test_multiple_items_with_nested_immutable_field():
+    class Foo(Structure):
+        s = Set[AnyOf[ImmutableInteger, String]]
+
+    assert Foo(s={1, 2, "x"}).s == {1, 2, "x"}
+    with raises(ValueError) as excinfo:
+        Foo(s={1, 2.5})
+    assert "s: 2.5 Did not match any field option" in str(excinfo.value)
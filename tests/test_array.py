@@ -339,3 +339,13 @@ def test_clear():
     foo = Foo(a=[1, 2, 3])
     foo.a.clear()
     assert len(foo.a) == 0
+
+
+def test_array_content_wrapper_has_no_instance_dict():
+    class Foo(Structure):
+        a = Array[Integer]
+
+    foo = Foo(a=[1, 2, 3])
+    assert not hasattr(foo.a, '__dict__')
+    foo.a.append(4)
+    assert foo.a == [1, 2, 3, 4]
@@ -126,3 +126,19 @@ def test_field_declaration_simplified_syntax_v051():
     assert bar.bar_names == ["john", "amber"]
     assert bar.table == "defgh"
     assert foo.table == "abcde"
+
+
+def test_methods_without_return_field_hint_are_not_fields():
+    class Foo(Structure):
+        i = Integer
+
+        def double(self):
+            return self.i * 2
+
+        def name(self) -> str:
+            return "foo"
+
+    foo = Foo(i=2)
+    assert foo.double() == 4
+    assert foo.name() == "foo"
+    assert set(Foo.get_all_fields_by_name()) == {"i"}
@@ -1,6 +1,6 @@
 from pytest import raises
 
-from typedpy import Integer, Structure
+from typedpy import Integer, PositiveInt, Structure
 
 
 class B(Structure):
@@ -12,3 +12,23 @@ def test_exclusive_max_violation_err():
         B(e = 10)
     assert "e: Got 10; Expected a maximum of less than 10" in str(excinfo.value)
 
+
+def test_positive_int_is_validated_once_per_assignment():
+    class CountingPositiveInt(PositiveInt):
+        calls = 0
+
+        def _validate(self, value):
+            CountingPositiveInt.calls += 1
+            super()._validate(value)
+
+    class Example(Structure):
+        quantity = CountingPositiveInt(maximum=100000, multiplesOf=5)
+
+    Example(quantity=150)
+    assert CountingPositiveInt.calls == 1
+    with raises(ValueError) as excinfo:
+        Example(quantity=151)
+    assert "quantity: Got 151; Expected a a multiple of 5" in str(excinfo.value)
+    with raises(ValueError) as excinfo:
+        Example(quantity=-5)
+    assert "quantity: Got -5; Expected a positive number" in str(excinfo.value)
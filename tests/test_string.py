@@ -191,3 +191,21 @@ def test_get_of_field_that_is_unpopulated_with_default_value():
 
     b = B(s='abcde')
     assert b.a == 'xyz'
+
+
+def test_pattern_is_validated_once_per_assignment():
+    class CountingString(String):
+        calls = 0
+
+        def _validate(self, value):
+            CountingString.calls += 1
+            super()._validate(value)
+
+    class Example(Structure):
+        s = CountingString(pattern='[A-Z]+$')
+
+    Example(s='ABC')
+    assert CountingString.calls == 1
+    with raises(ValueError) as excinfo:
+        Example(s='abc')
+    assert 's: Got \'abc\'; Does not match regular expression: "[A-Z]+$"' in str(excinfo.value)
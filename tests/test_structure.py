@@ -1,13 +1,16 @@
 import enum
+import gc
 import sys
 import typing
+import weakref
+from math import sqrt
 
 import pytest
 from pytest import raises
 
 from typedpy import Structure, DecimalNumber, PositiveInt, String, Enum, Field, Integer, Map, Array, AnyOf, NoneField, \
-    DateField, DateTime
-from typedpy.structures import FinalStructure, unique, MAX_NUMBER_OF_INSTANCES_TO_VERIFY_UNIQUENESS
+    DateField, DateTime, Set
+from typedpy.structures import FinalStructure, ImmutableStructure, unique, MAX_NUMBER_OF_INSTANCES_TO_VERIFY_UNIQUENESS
 
 
 class Venue(enum.Enum):
@@ -22,17 +25,18 @@ class Trader(Structure):
     alias: String(maxLength=32)
 
 
-def test_optional_fields():
-    class Trade(Structure):
-        notional: DecimalNumber(maximum=10000, minimum=0)
-        quantity: PositiveInt(maximum=100000, multiplesOf=5)
-        symbol: String(pattern='[A-Z]+$', maxLength=6)
-        buyer: Trader
-        seller: Trader
-        venue: Enum[Venue]
-        comment: String
-        _optional = ["comment", "venue"]
+class Trade(Structure):
+    notional: DecimalNumber(maximum=10000, minimum=0)
+    quantity: PositiveInt(maximum=100000, multiplesOf=5)
+    symbol: String(pattern='[A-Z]+$', maxLength=6)
+    buyer: Trader
+    seller: Trader
+    venue: Enum[Venue]
+    comment: String
+    _optional = ["comment", "venue"]
+
 
+def test_optional_fields():
     assert set(Trade._required) == {'notional', 'quantity', 'symbol', 'buyer', 'seller'}
     Trade(notional=1000, quantity=150, symbol="APPL",
           buyer=Trader(lei="12345678901234567890", alias="GSET"),
@@ -87,22 +91,16 @@ def test_optional_fields_required_overrides1():
     assert "missing a required argument: 'venue'" in str(excinfo.value)
 
 
-@pytest.fixture(scope="session")
-def Point():
-    from math import sqrt
-
-    class PointClass:
-        def __init__(self, x, y):
-            self.x = x
-            self.y = y
-
-        def size(self):
-            return sqrt(self.x ** 2 + self.y ** 2)
+class Point:
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
 
-    return PointClass
+    def size(self):
+        return sqrt(self.x ** 2 + self.y ** 2)
 
 
-def test_field_of_class(Point):
+def test_field_of_class():
     class Foo(Structure):
         i: int
         point: Field[Point]
@@ -112,7 +110,7 @@ def test_field_of_class(Point):
 
 
 @pytest.mark.skipif(sys.version_info < (3, 9), reason="requires python3.9 or higher")
-def test_ignore_none(Point):
+def test_ignore_none():
     class Foo(Structure):
         i: list[int]
         maybe_date: typing.Optional[DateField]
@@ -126,7 +124,7 @@ def test_ignore_none(Point):
         assert Foo(i=[5], maybe_date="2020-01-31a")
 
 
-def test_do_not_ignore_none(Point):
+def test_do_not_ignore_none():
     class Foo(Structure):
         i = Integer
         point: Field[Point]
@@ -137,7 +135,7 @@ def test_do_not_ignore_none(Point):
     assert "i: Got None; Expected a number" in str(excinfo.value)
 
 
-def test_do_not_ignore_none_for_required_fields(Point):
+def test_do_not_ignore_none_for_required_fields():
     class Foo(Structure):
         i: int
         date = typing.Optional[DateField]
@@ -148,18 +146,52 @@ def test_do_not_ignore_none_for_required_fields(Point):
     assert "i: Got None; Expected a number" in str(excinfo.value)
 
 
-def test_field_of_class_typeerror(Point):
+def test_field_of_class_typeerror():
     class Foo(Structure):
         i: int
         point: Field[Point]
 
     with raises(TypeError) as excinfo:
         Foo(i=5, point="xyz")
-    assert "point: Expected <class 'test_structure.Point.<locals>.PointClass'>; Got 'xyz'" in str(
+    assert "point: Expected <class 'test_structure.Point'>; Got 'xyz'" in str(
         excinfo.value)
 
 
-def test_using_arbitrary_class_in_anyof(Point):
+def test_field_of_classes_with_the_same_name():
+    def make_class():
+        class Point:
+            pass
+
+        return Point
+
+    first_point, second_point = make_class(), make_class()
+
+    class Foo(Structure):
+        first: Field[first_point]
+        second: Field[second_point]
+
+    foo = Foo(first=first_point(), second=second_point())
+    assert isinstance(foo.second, second_point)
+    with raises(TypeError):
+        Foo(first=first_point(), second=first_point())
+    assert isinstance(Field[first_point], Field)
+    assert Field[first_point] is not Field[first_point]
+
+
+def test_field_of_class_does_not_keep_the_class_alive():
+    class Point:
+        pass
+
+    class Foo(Structure):
+        p: Field[Point]
+
+    point_ref = weakref.ref(Point)
+    del Foo, Point
+    gc.collect()
+    assert point_ref() is None
+
+
+def test_using_arbitrary_class_in_anyof():
     class Foo(Structure):
         i: int
         point: AnyOf[Point, int]
@@ -167,7 +199,7 @@ def test_using_arbitrary_class_in_anyof(Point):
     assert Foo(i=1, point=2).point == 2
 
 
-def test_using_arbitrary_class_in_union(Point):
+def test_using_arbitrary_class_in_union():
     class Foo(Structure):
         i: int
         point: typing.Union[Point, int]
@@ -175,7 +207,7 @@ def test_using_arbitrary_class_in_union(Point):
     assert Foo(i=1, point=2).point == 2
 
 
-def test_optional(Point):
+def test_optional():
     class Foo(Structure):
         i: int
         point: typing.Optional[Point]
@@ -190,7 +222,7 @@ def test_optional(Point):
     assert foo.point.size() == 5
 
 
-def test_optional_err(Point):
+def test_optional_err():
     class Foo(Structure):
         i: int
         point: typing.Optional[Point]
@@ -201,7 +233,7 @@ def test_optional_err(Point):
         excinfo.value)
 
 
-def test_field_of_class_in_map(Point):
+def test_field_of_class_in_map():
     class Foo(Structure):
         i: int
         point_by_int: Map[Integer, Field[Point]]
@@ -210,7 +242,7 @@ def test_field_of_class_in_map(Point):
     assert foo.point_by_int[1].size() == 5
 
 
-def test_field_of_class_in_map_simpler_syntax(Point):
+def test_field_of_class_in_map_simpler_syntax():
     class Foo(Structure):
         i: int
         point_by_int: Map[Integer, Point]
@@ -219,25 +251,25 @@ def test_field_of_class_in_map_simpler_syntax(Point):
     assert foo.point_by_int[1].size() == 5
 
 
-def test_field_of_class_in_map_typerror(Point):
+def test_field_of_class_in_map_typerror():
     class Foo(Structure):
         i: int
         point_by_int: Map[Integer, Field[Point]]
 
     with raises(TypeError) as excinfo:
         Foo(i=5, point_by_int={1: Point(3, 4), 2: 3})
-    assert "point_by_int_value: Expected <class 'test_structure.Point.<locals>.PointClass'>; Got 3" in str(
+    assert "point_by_int_value: Expected <class 'test_structure.Point'>; Got 3" in str(
         excinfo.value)
 
 
-def test_field_of_class_in_map__simpler_syntax_typerror(Point):
+def test_field_of_class_in_map__simpler_syntax_typerror():
     class Foo(Structure):
         i: int
         point_by_int: Map[Integer, Point]
 
     with raises(TypeError) as excinfo:
         Foo(i=5, point_by_int={1: Point(3, 4), 2: 3})
-    assert "point_by_int_value: Expected <class 'test_structure.Point.<locals>.PointClass'>; Got 3" in str(
+    assert "point_by_int_value: Expected <class 'test_structure.Point'>; Got 3" in str(
         excinfo.value)
 
 
@@ -276,6 +308,19 @@ def test_final_structure_violation():
         excinfo.value)
 
 
+def test_final_structure_violation_with_mixin():
+    class Foo(FinalStructure):
+        s: str
+
+    class Mixin:
+        pass
+
+    with raises(TypeError) as excinfo:
+        class Bar(Mixin, Foo): pass
+    assert "Tried to extend Foo, which is a FinalStructure. This is forbidden" in str(
+        excinfo.value)
+
+
 def test_final_structure_no_violation():
     class Foo(Structure):
         s: str
@@ -313,6 +358,33 @@ def test_unique_violation_by_update():
         excinfo.value)
 
 
+def test_unique_update_releases_previous_value():
+    @unique
+    class Foo(Structure):
+        s: str
+        i: int
+        a: typing.List[int]
+
+    foo = Foo(s="xxx", i=1, a=[1])
+    foo.i = 1
+    foo.i = 2
+    Foo(s="xxx", i=1, a=[1])
+    with raises(ValueError):
+        Foo(s="xxx", i=2, a=[1])
+
+
+def test_unique_values_with_colliding_hashes():
+    @unique
+    class Foo(Structure):
+        i = Integer
+
+    assert hash(-1) == hash(-2)
+    Foo(i=-1)
+    Foo(i=-2)
+    with raises(ValueError):
+        Foo(i=-1)
+
+
 def test_unique_violation_stop_checking__if_too_many_instances():
     @unique
     class Foo(Structure):
@@ -325,28 +397,82 @@ def test_unique_violation_stop_checking__if_too_many_instances():
 
 
 def test_copy_with_overrides():
-    class Trade(Structure):
-        notional: DecimalNumber(maximum=10000, minimum=0)
-        quantity: PositiveInt(maximum=100000, multiplesOf=5)
-        symbol: String(pattern='[A-Z]+$', maxLength=6)
+    class TradeWithTimestamp(Trade):
         timestamp = DateTime
-        buyer: Trader
-        seller: Trader
-        venue: Enum[Venue]
-        comment: String
-        _optional = ["comment", "venue"]
 
-    trade_1 = Trade(notional=1000, quantity=150, symbol="APPL",
-                    buyer=Trader(lei="12345678901234567890", alias="GSET"),
-                    seller=Trader(lei="12345678901234567888", alias="MSIM"),
-                    timestamp="01/30/20 05:35:35",
-                    )
+    trade_1 = TradeWithTimestamp(notional=1000, quantity=150, symbol="APPL",
+                                 buyer=Trader(lei="12345678901234567890", alias="GSET"),
+                                 seller=Trader(lei="12345678901234567888", alias="MSIM"),
+                                 timestamp="01/30/20 05:35:35",
+                                 )
     trade_2 = trade_1.shallow_clone_with_overrides(notional=500)
     assert trade_2.notional == 500
     trade_2.notional = 1000
     assert trade_2 == trade_1
 
 
+def test_copy_with_overrides_of_immutable_with_collections():
+    class Foo(ImmutableStructure):
+        i = Integer
+        a = Array[Integer]
+        _additionalProperties = False
+
+    first = Foo(i=5, a=[1, 2])
+    second = first.shallow_clone_with_overrides(i=6)
+    assert second == Foo(i=6, a=[1, 2])
+    assert first.i == 5
+    with raises(ValueError):
+        second.a.append(3)
+    with raises(TypeError) as excinfo:
+        first.shallow_clone_with_overrides(i="x")
+    assert "i: Expected <class 'int'>; Got 'x'" in str(excinfo.value)
+    with raises(TypeError) as excinfo:
+        first.shallow_clone_with_overrides(x=1)
+    assert "got an unexpected keyword argument 'x'" in str(excinfo.value)
+
+
+def test_copy_with_overrides_does_not_share_collections():
+    class Foo(Structure):
+        a = Array[Integer]
+        m = Map[String, Integer]
+        s = Set[Integer]
+
+    first = Foo(a=[1], m={"x": 1}, s={1})
+    second = first.shallow_clone_with_overrides()
+    second.a.append(2)
+    second.m["y"] = 2
+    second.s.add(2)
+    assert first == Foo(a=[1], m={"x": 1}, s={1})
+    assert second == Foo(a=[1, 2], m={"x": 1, "y": 2}, s={1, 2})
+
+
+def test_copy_with_overrides_drops_additional_properties():
+    class Foo(Structure):
+        i = Integer
+
+    first = Foo(i=1, x=5)
+    second = first.shallow_clone_with_overrides(i=2)
+    assert second == Foo(i=2)
+    assert "x" not in second.__dict__
+    assert first.shallow_clone_with_overrides(x=6).x == 6
+
+
+def test_copy_with_overrides_uses_custom_init():
+    calls = []
+
+    class Foo(Structure):
+        i = Integer
+
+        def __init__(self, **kwargs):
+            calls.append(kwargs)
+            super().__init__(**kwargs)
+
+    first = Foo(i=1)
+    second = first.shallow_clone_with_overrides(i=2)
+    assert second == Foo(i=2)
+    assert calls[1] == {"i": 2}
+
+
 def test_defect_required_should_propagate_with_ignore_none():
     class Foo(Structure):
         a = Integer
@@ -191,3 +191,32 @@ def test_get_field_by_name():
     assert ssid_field.__class__ is String
     assert ssid_field.pattern == '[A-Za-z]+$'
     assert ssid_field.minLength == 3
+
+
+def test_get_field_by_name_is_not_shared_with_subclass():
+    class Foo(Structure):
+        a = Integer
+
+    assert set(Foo.get_all_fields_by_name()) == {'a'}
+
+    class Bar(Foo):
+        b = String
+
+    assert set(Bar.get_all_fields_by_name()) == {'a', 'b'}
+    assert set(Foo.get_all_fields_by_name()) == {'a'}
+    Foo.get_all_fields_by_name().clear()
+    assert set(Foo.get_all_fields_by_name()) == {'a'}
+
+
+def test_equality_treats_unset_and_none_alike():
+    class Foo(Structure):
+        a = Integer
+        b = AnyOf[Array[Integer], None]
+        _required = []
+
+    assert Foo(a=1, b=[1]) == Foo(a=1, b=[1])
+    assert Foo(a=1) == Foo(a=1, b=None)
+    assert Foo(a=1, b=None) == Foo(a=1)
+    assert Foo(a=1) != Foo(a=1, b=[1])
+    assert Foo(a=1, b=[1]) != Foo(a=1)
+    assert Foo(a=1, b=[1]) != Foo(a=1, b=[2])
@@ -3,7 +3,7 @@ Definitions of various types of fields. Supports JSON draft4 types.
 """
 import enum
 import re
-from collections import OrderedDict, deque
+from collections import deque
 from collections.abc import Iterable
 
 from copy import deepcopy
@@ -41,6 +41,14 @@ class SerializableField(Field):
         return value
 
 
+def _is_number(val):
+    return isinstance(val, (float, int, Decimal))
+
+
+def _err_prefix(field, value):
+    return "{}: Got {}; ".format(field._name, wrap_val(value)) if field._name else ""
+
+
 def _map_to_field(item):
     item = item[0] if isinstance(item, (list, tuple)) and len(item) == 1 else item
     if isinstance(item, StructMeta) and not isinstance(item, Field):
@@ -144,16 +152,8 @@ class Number(Field):
 
     @staticmethod
     def _validate_static(self, value):
-        def is_number(val):
-            return isinstance(val, (float, int, Decimal))
-
-        def err_prefix():
-            return (
-                "{}: Got {}; ".format(self._name, wrap_val(value)) if self._name else ""
-            )
-
-        if not is_number(value):
-            raise TypeError("{}Expected a number".format(err_prefix()))
+        if not _is_number(value):
+            raise TypeError("{}Expected a number".format(_err_prefix(self, value)))
         if (
             isinstance(self.multiplesOf, float)
             and int(value / self.multiplesOf) != value / self.multiplesOf
@@ -161,30 +161,39 @@ class Number(Field):
             and value % self.multiplesOf
         ):
             raise ValueError(
-                "{}Expected a a multiple of {}".format(err_prefix(), self.multiplesOf)
+                "{}Expected a a multiple of {}".format(
+                    _err_prefix(self, value), self.multiplesOf
+                )
             )
-        if (is_number(self.minimum)) and self.minimum > value:
+        if (_is_number(self.minimum)) and self.minimum > value:
             raise ValueError(
-                "{}Expected a minimum of {}".format(err_prefix(), self.minimum)
+                "{}Expected a minimum of {}".format(
+                    _err_prefix(self, value), self.minimum
+                )
             )
-        if is_number(self.maximum):
+        if _is_number(self.maximum):
             if self.exclusiveMaximum and self.maximum == value:
                 raise ValueError(
                     "{}Expected a maximum of less than {}".format(
-                        err_prefix(), self.maximum
+                        _err_prefix(self, value), self.maximum
                     )
                 )
             else:
                 if self.maximum < value:
                     raise ValueError(
-                        "{}Expected a maximum of {}".format(err_prefix(), self.maximum)
+                        "{}Expected a maximum of {}".format(
+                            _err_prefix(self, value), self.maximum
+                        )
                     )
 
     def _validate(self, value):
         Number._validate_static(self, value)
 
     def __set__(self, instance, value):
-        if not getattr(instance, "_skip_validation", False):
+        # in a TypedField, such as Integer, TypedField.__set__ already runs the same validation
+        if not isinstance(self, TypedField) and not getattr(
+            instance, "_skip_validation", False
+        ):
             self._validate(value)
         super().__set__(instance, value)
 
@@ -251,31 +260,31 @@ class String(TypedField):
 
     @staticmethod
     def _validate_static(self, value):
-        def err_prefix():
-            return (
-                "{}: Got {}; ".format(self._name, wrap_val(value)) if self._name else ""
-            )
-
         if not isinstance(value, str):
-            raise TypeError("{}Expected a string".format(err_prefix()))
+            raise TypeError("{}Expected a string".format(_err_prefix(self, value)))
         if self.maxLength is not None and len(value) > self.maxLength:
             raise ValueError(
-                "{}Expected a maximum length of {}".format(err_prefix(), self.maxLength)
+                "{}Expected a maximum length of {}".format(
+                    _err_prefix(self, value), self.maxLength
+                )
             )
         if self.minLength is not None and len(value) < self.minLength:
             raise ValueError(
-                "{}Expected a minimum length of {}".format(err_prefix(), self.minLength)
+                "{}Expected a minimum length of {}".format(
+                    _err_prefix(self, value), self.minLength
+                )
             )
         if self.pattern is not None and not self._compiled_pattern.match(value):
             raise ValueError(
                 '{}Does not match regular expression: "{}"'.format(
-                    err_prefix(), self.pattern
+                    _err_prefix(self, value), self.pattern
                 )
             )
 
     def __set__(self, instance, value):
         self._validate(value)
-        super().__set__(instance, value)
+        # the value was just validated, so skip the identical check in TypedField.__set__
+        super(TypedField, self).__set__(instance, value)
 
 
 class Function(Field):
@@ -284,22 +293,11 @@ class Function(Field):
     """
 
     _bound_method_type = type(Field().__init__)
+    _function_types = frozenset({type(lambda x: x), type(open), _bound_method_type})
 
     def __set__(self, instance, value):
-        def is_function(f):
-            return type(f) in {
-                type(lambda x: x),
-                type(open),
-                Function._bound_method_type,
-            }
-
-        def err_prefix():
-            return (
-                "{}: Got {}; ".format(self._name, wrap_val(value)) if self._name else ""
-            )
-
-        if not is_function(value):
-            raise TypeError("{}Expected a function".format(err_prefix()))
+        if type(value) not in Function._function_types:
+            raise TypeError("{}Expected a function".format(_err_prefix(self, value)))
         super().__set__(instance, value)
 
 
@@ -380,6 +378,8 @@ class PositiveInt(Integer, Positive):
 
 
 class _IteratorProxyMixin:
+    __slots__ = ()
+
     class ListIteratorProxy:
         def __init__(self, the_list):
             self.the_list = the_list
@@ -400,6 +400,8 @@ class _ListStruct(list, ImmutableMixin, _IteratorProxyMixin):
     Will not bypass the validation of the Array.
     """
 
+    __slots__ = ("_field_definition", "_instance", "_name")
+
     def __init__(self, array: Field, struct_instance: Structure, mylist, name: str):
         self._field_definition = array
         self._instance = struct_instance
@@ -497,6 +499,8 @@ class _DequeStruct(deque, ImmutableMixin, _IteratorProxyMixin):
     Will not bypass the validation of the Array.
     """
 
+    __slots__ = ("_field_definition", "_instance", "_name")
+
     def __init__(
         self,
         deq: Field = None,
@@ -646,6 +650,8 @@ class _DictStruct(dict, ImmutableMixin):
     ...will not bypass the validation of the Map.
     """
 
+    __slots__ = ("_field_definition", "_instance", "_name")
+
     def __init__(self, the_map, struct_instance, mydict, name):
         self._field_definition = the_map
         self._instance = struct_instance
@@ -773,6 +779,27 @@ class ContainNestedFieldMixin(Field):
                     item._set_immutable(immutable)
 
 
+def _needs_fresh_structure_per_item(*fields):
+    """
+    Items of a collection are validated by assigning them to a temporary Structure.
+    Immutable or unique fields cannot be assigned more than once to the same Structure,
+    so these require a new one for every item. This includes such fields that are
+    nested in the given ones (e.g. an option of AnyOf).
+    """
+    for field in fields:
+        if not isinstance(field, Field):
+            continue
+        if getattr(field, "_immutable", False) or field.defined_as_unique():
+            return True
+        items = getattr(field, "items", None)
+        nested = list(items) if isinstance(items, (list, tuple)) else [items]
+        if isinstance(field, MultiFieldWrapper):
+            nested.extend(field.get_fields())
+        if _needs_fresh_structure_per_item(*nested):
+            return True
+    return False
+
+
 class SizedCollection:
     def __init__(self, *args, minItems=None, maxItems=None, **kwargs):
         self.minItems = minItems
@@ -851,8 +878,11 @@ class Set(
         if self.items is not None:
             setattr(self.items, "_name", self._name)
             res = []
+            fresh_structure_per_item = _needs_fresh_structure_per_item(self.items)
+            temp_st = Structure()
             for val in value:
-                temp_st = Structure()
+                if fresh_structure_per_item:
+                    temp_st = Structure()
                 self.items.__set__(temp_st, val)
                 res.append(getattr(temp_st, getattr(self.items, "_name")))
             value = cls(res)
@@ -920,15 +950,16 @@ class Map(
             key_field, value_field = self.items[0], self.items[1]
             setattr(key_field, "_name", self._name + "_key")
             setattr(value_field, "_name", self._name + "_value")
-            res = OrderedDict()
-
+            set_key, set_value = key_field.__set__, value_field.__set__
+            fresh_structure_per_item = _needs_fresh_structure_per_item(
+                key_field, value_field
+            )
+            temp_st = Structure()
             for key, val in value.items():
-                temp_st = Structure()
-                key_field.__set__(temp_st, key)
-                value_field.__set__(temp_st, val)
-                res[getattr(temp_st, getattr(key_field, "_name"))] = getattr(
-                    temp_st, getattr(value_field, "_name")
-                )
+                if fresh_structure_per_item:
+                    temp_st = Structure()
+                set_key(temp_st, key)
+                set_value(temp_st, val)
         super().__set__(instance, _DictStruct(self, instance, value, self._name))
 
 
@@ -1005,8 +1036,11 @@ class Array(
             if isinstance(self.items, Field):
                 setattr(self.items, "_name", self._name)
                 res = []
+                fresh_structure_per_item = _needs_fresh_structure_per_item(self.items)
+                temp_st = Structure()
                 for i, val in enumerate(value):
-                    temp_st = Structure()
+                    if fresh_structure_per_item:
+                        temp_st = Structure()
                     setattr(self.items, "_name", self._name + "_{}".format(str(i)))
                     self.items.__set__(temp_st, val)
                     res.append(getattr(temp_st, getattr(self.items, "_name")))
@@ -1111,8 +1145,11 @@ class Deque(
             if isinstance(self.items, Field):
                 setattr(self.items, "_name", self._name)
                 res = deque()
+                fresh_structure_per_item = _needs_fresh_structure_per_item(self.items)
+                temp_st = Structure()
                 for i, val in enumerate(value):
-                    temp_st = Structure()
+                    if fresh_structure_per_item:
+                        temp_st = Structure()
                     setattr(self.items, "_name", self._name + "_{}".format(str(i)))
                     self.items.__set__(temp_st, val)
                     res.append(getattr(temp_st, getattr(self.items, "_name")))
@@ -1291,6 +1328,7 @@ class Enum(Field, metaclass=_EnumMeta):
         self._is_enum = isinstance(values, (type,)) and issubclass(values, enum.Enum)
         if self._is_enum:
             self._enum_class = values
+            self._enum_names = frozenset(v.name for v in values)
             self.values = list(values)
         else:
             self.values = values
@@ -1298,8 +1336,7 @@ class Enum(Field, metaclass=_EnumMeta):
 
     def _validate(self, value):
         if self._is_enum:
-            enum_names = {v.name for v in self._enum_class}
-            if value not in enum_names and not isinstance(value, (self._enum_class,)):
+            if not isinstance(value, self._enum_class) and value not in self._enum_names:
                 enum_values = [r.name for r in self._enum_class]
                 if len(enum_values) < 11:
                     raise ValueError(
@@ -1447,6 +1484,10 @@ class AnyOf(MultiFieldWrapper, Field, metaclass=_JSONSchemaDraft4ReuseMeta):
                     self._is_optional = True
 
     def __set__(self, instance, value):
+        if value is None and getattr(self, "_is_optional", False):
+            # one of the options is a NoneField, so there is no need to try them all
+            super().__set__(instance, value)
+            return
         matched = False
         for field in self.get_fields():
             setattr(field, "_name", self._name)
@@ -10,18 +10,21 @@ from inspect import Signature, Parameter, signature
 import sys
 import typing
 import hashlib
+import weakref
 
 from typing import get_type_hints, Iterable
 
 from typedpy.commons import wrap_val, _is_sunder, _is_dunder
 
 REQUIRED_FIELDS = "_required"
+REQUIRED_FIELDS_SET = "_required_set"
 DEFAULTS = "_defaults"
 ADDITIONAL_PROPERTIES = "_additionalProperties"
 IS_IMMUTABLE = "_immutable"
 OPTIONAL_FIELDS = "_optional"
 MUST_BE_UNIQUE = "_must_be_unique"
 IGNORE_NONE_VALUES = "_ignore_none"
+FIELDS_BY_NAME_CACHE = "_fields_by_name"
 MAX_NUMBER_OF_INSTANCES_TO_VERIFY_UNIQUENESS = 100000
 
 py_version = sys.version_info[0:2]
@@ -31,6 +34,8 @@ python_ver_atleast_39 = py_version >= (3, 9)
 
 
 class ImmutableMixin:
+    __slots__ = ()
+
     _field_definition = None
     _instance = None
 
@@ -38,10 +43,12 @@ class ImmutableMixin:
         return deepcopy(value) if self._is_immutable() else value
 
     def _is_immutable(self):
-        if getattr(self._field_definition, "_immutable", False):
+        # the attributes may be unset while unpickling a subclass with __slots__
+        field_definition = getattr(self, "_field_definition", None)
+        if getattr(field_definition, "_immutable", False):
             return True
         instance = getattr(self, "_instance", None)
-        return getattr(self._instance, IS_IMMUTABLE, False) if instance else False
+        return getattr(instance, IS_IMMUTABLE, False) if instance else False
 
     def _raise_if_immutable(self):
         if self._is_immutable():
@@ -133,6 +140,11 @@ def get_base_info(bases):
 
 
 def _check_for_final_violations(classes):
+    """
+    :param classes: the new class, followed by its direct bases. There is no need to walk
+           the whole MRO, since an extension of a final class could never have been created
+    """
+
     def is_sub_class(c, base):
         return issubclass(c, base) and c != base
 
@@ -164,11 +176,11 @@ def _check_for_final_violations(classes):
 
 
 class _FieldMeta(type):
-    _registry = {}
+    _registry = weakref.WeakKeyDictionary()
 
     def __new__(cls, name, bases, cls_dict):
         clsobj = super().__new__(cls, name, bases, dict(cls_dict))
-        _check_for_final_violations(clsobj.mro())
+        _check_for_final_violations((clsobj,) + clsobj.__bases__)
         return clsobj
 
     def __getitem__(cls, val):
@@ -193,14 +205,18 @@ class _FieldMeta(type):
                 raise TypeError(
                     "Unsupported field type in definition: {}".format(wrap_val(val))
                 )
+            # the wrapper Field class is created once per wrapped class. Both are
+            # referenced weakly, since the wrapper references the wrapped class.
+            wrapper_ref = _FieldMeta._registry.get(val)
+            class_as_field = wrapper_ref() if wrapper_ref is not None else None
+            if class_as_field is not None:
+                return class_as_field()
             the_class = val.__name__
-            if the_class in _FieldMeta._registry:
-                return _FieldMeta._registry[the_class]
             short_hash = hashlib.sha256(the_class.encode("utf-8")).hexdigest()[:8]
             new_name = "Field_{}_{}".format(the_class, short_hash)
             class_as_field = create_typed_field(new_name, val)
             class_as_field.__getstate__ = get_state
-            _FieldMeta._registry[the_class] = class_as_field
+            _FieldMeta._registry[val] = weakref.ref(class_as_field)
             return class_as_field()
 
 
@@ -208,25 +224,45 @@ class UniqueMixin:
     def defined_as_unique(self):
         return getattr(self, MUST_BE_UNIQUE, False)
 
-    def __manage_uniqueness__(self):
+    def __uniqueness_key__(self):
+        """
+        A key that identifies the content of the instance, used to detect copies.
+        This is the (name, value) pairs themselves, so that only equal content is
+        considered a copy, falling back to the hash of the string representation
+        if some of the values are not hashable.
+        """
+        values = tuple(
+            sorted((k, v) for k, v in self.__dict__.items() if k != "_instantiated")
+        )
+        try:
+            hash(values)
+        except TypeError:
+            return self.__hash__()
+        return values
+
+    def __manage_uniqueness__(self, previous_key=None):
         myclass = self.__class__
-        if (
-                getattr(myclass, MUST_BE_UNIQUE, False)
-                and len(getattr(myclass, "_ALL_INSTANCES", set()))
-                < MAX_NUMBER_OF_INSTANCES_TO_VERIFY_UNIQUENESS
-        ):
-            hash_of_instance = self.__hash__()
-            if hash_of_instance in getattr(myclass, "_ALL_INSTANCES", set()):
+        if not getattr(myclass, MUST_BE_UNIQUE, False):
+            return
+        all_instances = getattr(myclass, "_ALL_INSTANCES", set())
+        if len(all_instances) < MAX_NUMBER_OF_INSTANCES_TO_VERIFY_UNIQUENESS:
+            key = self.__uniqueness_key__()
+            if key == previous_key:
+                return
+            if key in all_instances:
                 classname = self.__class__.__name__
                 raise ValueError(
                     "Instance copy in {}, which is defined as unique. Instance is {}".format(
                         classname, self
                     )
                 )
-            getattr(myclass, "_ALL_INSTANCES", set()).add(hash_of_instance)
+            all_instances.discard(previous_key)
+            all_instances.add(key)
 
     def __manage_uniqueness_for_field__(self, instance, value):
-        if not getattr(instance, "_instantiated", False):
+        if not getattr(self, MUST_BE_UNIQUE, False) or not getattr(
+                instance, "_instantiated", False
+        ):
             return
         field_name = getattr(self, "_name")
         structure_class_name = instance.__class__.__name__
@@ -237,8 +273,7 @@ class UniqueMixin:
             structure_class_name
         ]
         if (
-                getattr(self, MUST_BE_UNIQUE, False)
-                and len(instance_by_value_for_current_struct)
+                len(instance_by_value_for_current_struct)
                 < MAX_NUMBER_OF_INSTANCES_TO_VERIFY_UNIQUENESS
         ):
             hash_of_field_val = value.__hash__()
@@ -386,6 +421,10 @@ class Field(UniqueMixin, metaclass=_FieldMeta):
 def is_function_returning_field(field_definition_candidate):
     python_ver_higher_than_36 = sys.version_info[0:2] != (3, 6)
     if callable(field_definition_candidate) and python_ver_higher_than_36:
+        # resolving the type hints is expensive, so only do it if there is a return annotation
+        raw_annotations = getattr(field_definition_candidate, "__annotations__", None)
+        if not isinstance(raw_annotations, dict) or "return" not in raw_annotations:
+            return False
         try:
             if len(signature(field_definition_candidate).parameters) > 0:
                 raise TypeError("function not allowed to accept any parameters")
@@ -401,6 +440,13 @@ def is_function_returning_field(field_definition_candidate):
 
 
 def _get_all_fields_by_name(cls):
+    """
+    The fields of the class, including inherited ones. Computed once per Structure class
+    and cached in the class itself (not inherited by subclasses). Do not mutate the result.
+    """
+    cached = cls.__dict__.get(FIELDS_BY_NAME_CACHE)
+    if cached is not None:
+        return cached
     all_classes = reversed([c for c in cls.mro() if isinstance(c, StructMeta)])
     all_fields_by_name = {}
     for the_class in all_classes:
@@ -408,6 +454,8 @@ def _get_all_fields_by_name(cls):
             field_names = getattr(the_class, "_fields", [])
             field_by_name = dict([(k, getattr(the_class, k)) for k in field_names])
             all_fields_by_name.update(field_by_name)
+    if isinstance(cls, StructMeta):
+        setattr(cls, FIELDS_BY_NAME_CACHE, all_fields_by_name)
     return all_fields_by_name
 
 
@@ -484,17 +532,25 @@ class StructMeta(type):
 
         cls_dict.pop(DEFAULTS, None)
         clsobj = super().__new__(cls, name, bases, dict(cls_dict))
-        _check_for_final_violations(clsobj.mro())
+        _check_for_final_violations((clsobj,) + clsobj.__bases__)
 
         clsobj._fields = fields
         default_required = (
             list(set(bases_required + fields)) if bases_params else fields
         )
         required = cls_dict.get(REQUIRED_FIELDS, default_required)
-        setattr(clsobj, REQUIRED_FIELDS, list(set(bases_required + required)))
+        all_required = set(bases_required + required)
+        setattr(clsobj, REQUIRED_FIELDS, list(all_required))
+        setattr(clsobj, REQUIRED_FIELDS_SET, frozenset(all_required))
         additional_props = cls_dict.get(ADDITIONAL_PROPERTIES, True)
         sig = make_signature(clsobj._fields, required, additional_props, bases_params)
         setattr(clsobj, "__signature__", sig)
+        clsobj._constructor_params = tuple(
+            (param.name, param.default is Parameter.empty)
+            for param in sig.parameters.values()
+            if param.kind != Parameter.VAR_KEYWORD
+        )
+        clsobj._constructor_accepts_kwargs = "kwargs" in sig.parameters
         return clsobj
 
     def __str__(cls):
@@ -701,21 +757,31 @@ class Structure(UniqueMixin, metaclass=StructMeta):
     """
 
     _fields = []
+    _constructor_params = ()
+    _constructor_accepts_kwargs = True
     _fail_fast = True
 
     def __init__(self, *args, **kwargs):
-        bound = getattr(self, "__signature__").bind(*args, **kwargs)
-        if "kwargs" in bound.arguments:
-            for name, val in bound.arguments["kwargs"].items():
+        arguments = (
+            getattr(self, "__signature__").bind(*args, **kwargs).arguments
+            if args
+            else self._bind_keywords(kwargs)
+        )
+        if "kwargs" in arguments:
+            for name, val in arguments["kwargs"].items():
                 setattr(self, name, val)
-            del bound.arguments["kwargs"]
+            del arguments["kwargs"]
 
+        self._assign_values(arguments)
+        self._complete_instantiation()
+
+    def _assign_values(self, values_by_name):
         if Structure.failing_fast():
-            for name, val in bound.arguments.items():
+            for name, val in values_by_name.items():
                 setattr(self, name, val)
         else:
             errors = []
-            for name, val in bound.arguments.items():
+            for name, val in values_by_name.items():
                 try:
                     setattr(self, name, val)
                 except (TypeError, ValueError) as ex:
@@ -724,11 +790,42 @@ class Structure(UniqueMixin, metaclass=StructMeta):
                 messages = json.dumps([str(e) for e in errors])
                 raise errors[0].__class__(messages) from errors[0]
 
+    def _complete_instantiation(self):
         self.__validate__()
         self._instantiated = True
         self.__manage_uniqueness__()
         self.__manage__uniqueness_of_all_fields__()
 
+    @classmethod
+    def _bind_keywords(cls, kwargs):
+        """
+        Equivalent to __signature__.bind(**kwargs).arguments, without the overhead of
+        inspect.Signature.bind. Note that it consumes kwargs.
+        """
+        arguments = {}
+        for name, is_required in cls._constructor_params:
+            if name in kwargs:
+                arguments[name] = kwargs.pop(name)
+            elif is_required:
+                raise TypeError("missing a required argument: {!r}".format(name))
+        if kwargs:
+            cls._verify_keywords_accepted(kwargs)
+            arguments["kwargs"] = kwargs
+        return arguments
+
+    @classmethod
+    def _verify_keywords_accepted(cls, keywords):
+        """
+        Raise the same error as __signature__.bind if one of the keywords is not a
+        parameter of the constructor, and the constructor does not accept **kwargs.
+        """
+        if cls._constructor_accepts_kwargs:
+            return
+        names = {name for (name, _) in cls._constructor_params}
+        for key in keywords:
+            if key not in names:
+                raise TypeError("got an unexpected keyword argument {!r}".format(key))
+
     def __manage__uniqueness_of_all_fields__(self):
         fields_by_name = _get_all_fields_by_name(self.__class__)
         for name, field in fields_by_name.items():
@@ -740,23 +837,28 @@ class Structure(UniqueMixin, metaclass=StructMeta):
             if key in self.__dict__:
                 raise ValueError("Structure is immutable")
             value = deepcopy(value)
-        if all(
-                [
-                    getattr(self, IGNORE_NONE_VALUES, False),
-                    value is None,
-                    key not in getattr(self.__class__, REQUIRED_FIELDS, []),
-                ]
+        if (
+                value is None
+                and getattr(self, IGNORE_NONE_VALUES, False)
+                and key not in getattr(self.__class__, REQUIRED_FIELDS_SET, frozenset())
         ):
             return
 
-        super().__setattr__(key, value)
-
-        if (
+        manage_uniqueness = (
                 getattr(self, "_instantiated", False)
                 and not _is_dunder(key)
                 and not _is_sunder(key)
-        ):
-            self.__manage_uniqueness__()
+        )
+        previous_key = (
+            self.__uniqueness_key__()
+            if manage_uniqueness and self.defined_as_unique()
+            else None
+        )
+
+        super().__setattr__(key, value)
+
+        if manage_uniqueness:
+            self.__manage_uniqueness__(previous_key)
 
     def __getstate__(self):
         fields_by_name = _get_all_fields_by_name(self.__class__)
@@ -804,12 +906,13 @@ class Structure(UniqueMixin, metaclass=StructMeta):
     def __eq__(self, other):
         if self.__class__ != other.__class__:
             return False
-        internal_props = ["_instantiated"]
-        for k, val in sorted(self.__dict__.items()):
-            if k not in internal_props and val != other.__dict__.get(k):
+        props, other_props = self.__dict__, other.__dict__
+        for k, val in props.items():
+            if k != "_instantiated" and val != other_props.get(k):
                 return False
-        for k, val in sorted(other.__dict__.items()):
-            if k not in internal_props and val != self.__dict__.get(k):
+        # values that appear in both were already compared above
+        for k, val in other_props.items():
+            if k not in props and k != "_instantiated" and val is not None:
                 return False
         return True
 
@@ -857,7 +960,7 @@ class Structure(UniqueMixin, metaclass=StructMeta):
 
     @classmethod
     def get_all_fields_by_name(cls):
-        return _get_all_fields_by_name(cls)
+        return dict(_get_all_fields_by_name(cls))
 
     def __contains__(self, item):
         field_by_name = _get_all_fields_by_name(self.__class__)
@@ -877,10 +980,39 @@ class Structure(UniqueMixin, metaclass=StructMeta):
         )
 
     def shallow_clone_with_overrides(self, **kw):
-        fields_names = self.get_all_fields_by_name().keys()
-        field_value_by_name = dict([(f, getattr(self, f)) for f in fields_names if getattr(self, f) is not None])
-        kw_args = {**field_value_by_name, **kw}
-        return self.__class__(**kw_args)
+        """
+        Create a shallow copy of this instance, with the given values overridden.
+        As with the constructor, only the values of fields are copied, so additional
+        properties are dropped. Only the overrides are validated by their fields,
+        since the rest of the values were already validated when they were assigned
+        to this instance. If the class defines its own __init__, the clone is created
+        through the constructor.
+        """
+        cls = self.__class__
+        fields_by_name = _get_all_fields_by_name(cls)
+        field_value_by_name = {
+            name: val
+            for (name, val) in self.__dict__.items()
+            if name in fields_by_name and val is not None
+        }
+        if cls.__init__ is not Structure.__init__:
+            return cls(**{**field_value_by_name, **kw})
+
+        cls._verify_keywords_accepted(kw)
+        result = cls.__new__(cls)
+        values_to_assign = {}
+        for key, val in field_value_by_name.items():
+            if key in kw:
+                continue
+            if isinstance(val, (ImmutableMixin, set)):
+                # collections are rebuilt by their field, so the clone does not share them
+                values_to_assign[key] = val
+            else:
+                result.__dict__[key] = val
+        values_to_assign.update(kw)
+        result._assign_values(values_to_assign)
+        result._complete_instantiation()
+        return result
 
     @staticmethod
     def set_fail_fast(fast_fail: bool):
@@ -943,12 +1075,15 @@ class TypedField(Field):
     _ty = object
 
     def _validate(self, value):
-        def err_prefix():
-            return "{}: ".format(self._name) if self._name else ""
-
-        if not isinstance(value, self._ty) and value is not None:
+        # checking the exact type first spares the isinstance call in the common case
+        if (
+                type(value) is not self._ty
+                and not isinstance(value, self._ty)
+                and value is not None
+        ):
+            prefix = "{}: ".format(self._name) if self._name else ""
             raise TypeError(
-                "{}Expected {}; Got {}".format(err_prefix(), self._ty, wrap_val(value))
+                "{}Expected {}; Got {}".format(prefix, self._ty, wrap_val(value))
             )
 
     def __set__(self, instance, value):